@@ -1,17 +1,25 @@
 """AI Pair Engineer - Intelligent code analysis powered by multiple LLM providers."""
 
 import streamlit as st
-from openai import OpenAI
+import streamlit.components.v1 as components
+import httpx
+from openai import OpenAI, AsyncOpenAI, APIStatusError, APITimeoutError, DefaultHttpxClient
+from openai import AuthenticationError as OpenAIAuthenticationError, RateLimitError as OpenAIRateLimitError
 from enum import Enum
-from typing import Optional, Tuple, Dict, List
-from pathlib import Path
-import zipfile
+from typing import Optional, Tuple, Dict, List, Iterator, Union
+from pathlib import Path, PurePosixPath
+import asyncio
+import codecs
+import functools
 import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 import os
 from dotenv import load_dotenv
 from ui_components import load_font_awesome, icon, Icons, render_icon_text
+import llm_cache
 
 load_dotenv()
 
@@ -28,89 +36,26 @@ st.set_page_config(
 load_font_awesome()
 
 
+@st.cache_data(show_spinner=False)
+def _read_asset(path: str) -> str:
+    return Path(path).read_text()
+
+
 def load_css() -> None:
-    """Load external CSS file."""
+    """Load external CSS file (read from disk once per process)."""
     try:
-        with open("assets/styles.css", "r") as f:
-            css = f.read()
-        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+        st.markdown(f"<style>{_read_asset('assets/styles.css')}</style>", unsafe_allow_html=True)
     except FileNotFoundError:
         st.markdown("<style>/* Fallback */</style>", unsafe_allow_html=True)
 
 
 def load_mobile_scripts() -> None:
     """Load mobile-specific scripts for better UX."""
-    st.markdown("""
-    <script>
-    (function() {
-        function setupMobileSidebar() {
-            const isMobile = window.innerWidth <= 768;
-            const sidebar = document.querySelector('[data-testid="stSidebar"]');
-            const toggleButton = document.querySelector('button[data-testid="baseButton-header"]');
-            
-            if (isMobile && sidebar) {
-                let overlay = document.querySelector('.sidebar-overlay');
-                if (!overlay) {
-                    overlay = document.createElement('div');
-                    overlay.className = 'sidebar-overlay';
-                    document.body.appendChild(overlay);
-                }
-                
-                if (toggleButton) {
-                    toggleButton.style.display = 'flex';
-                    toggleButton.style.zIndex = '1000';
-                    toggleButton.style.position = 'fixed';
-                    toggleButton.style.top = '1rem';
-                    toggleButton.style.left = '1rem';
-                }
-                
-                function updateOverlay() {
-                    const isExpanded = sidebar.getAttribute('aria-expanded') === 'true';
-                    if (isExpanded) {
-                        overlay.classList.add('active');
-                        document.body.style.overflow = 'hidden';
-                    } else {
-                        overlay.classList.remove('active');
-                        document.body.style.overflow = '';
-                    }
-                }
-                
-                overlay.addEventListener('click', () => {
-                    if (toggleButton && sidebar.getAttribute('aria-expanded') === 'true') {
-                        toggleButton.click();
-                    }
-                });
-                
-                const observer = new MutationObserver(() => {
-                    updateOverlay();
-                });
-                
-                observer.observe(sidebar, {
-                    attributes: true,
-                    attributeFilter: ['aria-expanded']
-                });
-                
-                updateOverlay();
-            }
-        }
-        
-        if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', setupMobileSidebar);
-        } else {
-            setupMobileSidebar();
-        }
-        
-        window.addEventListener('resize', setupMobileSidebar);
-        
-        const inputs = document.querySelectorAll('input[type="text"], input[type="password"], textarea, select');
-        inputs.forEach(input => {
-            if (input.style.fontSize === '' || parseFloat(input.style.fontSize) < 16) {
-                input.style.fontSize = '16px';
-            }
-        });
-    })();
-    </script>
-    """, unsafe_allow_html=True)
+    # Scripts in st.markdown never run; a zero-height component iframe does, and reaches the page via window.parent.
+    try:
+        components.html(f"<script>{_read_asset('assets/mobile.js')}</script>", height=0)
+    except FileNotFoundError:
+        pass
 
 
 def load_api_key_hover_script() -> None:
@@ -175,6 +120,26 @@ DEFAULT_MODEL = "openai/gpt-4o-mini"
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 MAX_PROJECT_FILES = 50
 MAX_PROJECT_SIZE = 500 * 1024
+MAX_KEEPALIVE_CONNECTIONS = 20
+MAX_CONCURRENT_REQUESTS = 8
+MAX_CACHED_CLIENTS = 8
+ZIP_READ_CHUNK_SIZE = 64 * 1024
+ZIP_READ_WORKERS = os.cpu_count() or 1
+
+# Icon HTML used in headings and notices is fixed, so it is rendered once at import instead of on every rerun.
+_ICON_TERMINAL = icon(Icons.TERMINAL, "1em")
+_ICON_SETTINGS = icon(Icons.SETTINGS, "1em")
+_ICON_DOLLAR = icon(Icons.DOLLAR, "1em")
+_ICON_INFO = icon(Icons.INFO, "1em")
+_ICON_GEAR = icon(Icons.GEAR, "1em")
+_ICON_FILE = icon(Icons.FILE, "1em")
+_ICON_FOLDER = icon(Icons.FOLDER, "1em")
+_ICON_CHART_GREEN = icon(Icons.CHART, "1em", "#10b981")
+_ICON_INFO_BLUE = icon(Icons.INFO, "1em", "#58a6ff")
+_ICON_HISTORY = icon(Icons.HISTORY, "1em")
+_ICON_WARNING_AMBER = icon(Icons.WARNING, "1em", "#f59e0b")
+_ICON_BULLSEYE = icon("bullseye", "1em")
+_ICON_DOLLAR_GREEN = icon(Icons.DOLLAR, "1em", "#10b981")
 
 SUPPORTED_MODELS = [
     "openai/gpt-4o-mini",
@@ -196,6 +161,7 @@ EXTENSION_TO_LANGUAGE = {
 }
 
 SUPPORTED_FILE_TYPES = ["py", "js", "ts", "tsx", "jsx", "java", "go", "rs", "cpp", "cc", "c", "cs", "rb", "php", "sql", "kt", "swift", "scala", "r", "txt"]
+SUPPORTED_SUFFIXES = frozenset(f".{ext}" for ext in SUPPORTED_FILE_TYPES)
 
 MODEL_COSTS = {
     "openai/gpt-4o-mini": {"input": 0.15, "output": 0.60},
@@ -208,6 +174,17 @@ MODEL_COSTS = {
     "qwen/qwen-2.5-72b-instruct": {"input": 0.35, "output": 0.40},
 }
 
+# Per-token prices (USD) derived once from the per-million rates above.
+COST_PER_TOKEN = {model: (costs["input"] / 1_000_000, costs["output"] / 1_000_000) for model, costs in MODEL_COSTS.items()}
+
+
+def _format_cost_info(input_cost: float, output_cost: float) -> str:
+    est_1k_cost = 1000 * input_cost + 500 * output_cost
+    return f"~${est_1k_cost:.4f}/1K tokens" if est_1k_cost >= 0.001 else f"~${est_1k_cost*1000:.2f}/1K tokens"
+
+
+MODEL_COST_INFO = {model: _format_cost_info(*per_token) for model, per_token in COST_PER_TOKEN.items()}
+
 MODEL_GROUPS = {
     "OpenAI": ["openai/gpt-4o-mini", "openai/gpt-4o"],
     "Anthropic": ["anthropic/claude-sonnet-4", "anthropic/claude-3-5-haiku"],
@@ -228,6 +205,10 @@ MODEL_DISPLAY_NAMES = {
     "qwen/qwen-2.5-72b-instruct": "Qwen 2.5 72B",
 }
 
+# Code is substituted in a single pass, so large inputs are copied once per request.
+USER_MESSAGE_TEMPLATE = "Please analyze this {lang} code:\n\n```{lang}\n{code}\n```"
+USER_MESSAGE_WITH_CONTEXT_TEMPLATE = USER_MESSAGE_TEMPLATE + "\nAdditional context: {context}"
+
 IGNORE_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'env', '.idea', '.vscode', 'dist', 'build', '.next', 'coverage'}
 IGNORE_FILES = {'.DS_Store', 'package-lock.json', 'yarn.lock', 'Pipfile.lock'}
 
@@ -270,14 +251,8 @@ class SessionStateManager:
 
     @staticmethod
     def init() -> None:
+        # Every accessor supplies its own default, so state is created lazily on first write.
         if "initialized" not in st.session_state:
-            st.session_state.history = []
-            st.session_state.total_tokens = {"input": 0, "output": 0}
-            st.session_state.total_cost = 0.0
-            st.session_state.code_input = ""
-            st.session_state.review_mode = "file"
-            st.session_state.analysis_mode = "FULL_REVIEW"
-            st.session_state.api_key = ""
             st.session_state.initialized = True
 
     @staticmethod
@@ -320,6 +295,11 @@ class SessionStateManager:
             st.session_state.total_cost = 0.0
         st.session_state.total_cost += cost
 
+    @staticmethod
+    def get_usage() -> Tuple[int, int, float]:
+        tokens = SessionStateManager.get_tokens()
+        return tokens.get("input", 0), tokens.get("output", 0), SessionStateManager.get_cost()
+
     @staticmethod
     def reset_cost_tracker() -> None:
         st.session_state.total_tokens = {"input": 0, "output": 0}
@@ -330,20 +310,35 @@ class SessionStateManager:
         return st.session_state.get(f"result_{mode_name}")
 
     @staticmethod
-    def set_result(mode_name: str, result: str) -> None:
+    def set_result(mode_name: str, result: str, from_cache: bool = False) -> None:
         st.session_state[f"result_{mode_name}"] = result
+        st.session_state[f"cached_result_{mode_name}"] = from_cache
+
+    @staticmethod
+    def is_cached_result(mode_name: str) -> bool:
+        return st.session_state.get(f"cached_result_{mode_name}", False)
 
     @staticmethod
     def clear_result(mode_name: str) -> None:
-        if f"result_{mode_name}" in st.session_state:
-            del st.session_state[f"result_{mode_name}"]
+        for key in (f"result_{mode_name}", f"cached_result_{mode_name}"):
+            if key in st.session_state:
+                del st.session_state[key]
 
     @staticmethod
     def clear_all_results() -> None:
-        keys_to_remove = [key for key in st.session_state.keys() if key.startswith("result_")]
+        keys_to_remove = [key for key in st.session_state.keys() if key.startswith("result_") or key.startswith("cached_result_")]
         for key in keys_to_remove:
             del st.session_state[key]
 
+    @staticmethod
+    def record_cache_lookup(hit: bool) -> None:
+        key = "cache_hits" if hit else "cache_misses"
+        st.session_state[key] = st.session_state.get(key, 0) + 1
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, int]:
+        return {"hits": st.session_state.get("cache_hits", 0), "misses": st.session_state.get("cache_misses", 0)}
+
 
 class APIError(Exception):
     pass
@@ -365,41 +360,109 @@ class TimeoutError(APIError):
     pass
 
 
+def _classify_api_error(e: Exception) -> APIError:
+    if isinstance(e, OpenAIAuthenticationError):
+        return AuthenticationError("Authentication failed. Please check your OpenRouter API key.")
+    if isinstance(e, OpenAIRateLimitError):
+        return RateLimitError("Rate limit exceeded. Please wait a moment and try again.")
+    if isinstance(e, APITimeoutError):
+        return TimeoutError("Request timed out. Please try again.")
+    if isinstance(e, APIStatusError) and e.status_code == 402:
+        return QuotaExceededError("Quota exceeded. Please check your OpenRouter account credits.")
+    return APIError(f"Error: {str(e)}. Please try again or check your connection.")
+
+
 class OpenRouterClient:
     """Handles OpenRouter API interactions."""
 
     def __init__(self, api_key: str):
-        self._client = OpenAI(api_key=api_key, base_url=OPENROUTER_BASE_URL)
+        self._api_key = api_key
+        self._client = OpenAI(
+            api_key=api_key,
+            base_url=OPENROUTER_BASE_URL,
+            http_client=DefaultHttpxClient(limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS))
+        )
 
-    def analyze_code(self, code: str, language: str, mode: ReviewMode, context: str = "", model: str = DEFAULT_MODEL, max_tokens: int = DEFAULT_MAX_TOKENS, temperature: float = DEFAULT_TEMPERATURE) -> Tuple[str, Dict[str, int]]:
-        user_message = f"Please analyze this {language} code:\n\n```{language}\n{code}\n```"
-        if context:
-            user_message += f"\nAdditional context: {context}"
+    def close(self) -> None:
+        self._client.close()
 
+    def __del__(self):
+        # A client evicted from the get_client cache is only garbage collected, so its pool is released here.
         try:
-            response = self._client.chat.completions.create(
+            self.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _build_messages(code: str, language: str, mode: ReviewMode, context: str) -> List[Dict[str, str]]:
+        template = USER_MESSAGE_WITH_CONTEXT_TEMPLATE if context else USER_MESSAGE_TEMPLATE
+        user_message = template.format_map({"lang": language, "code": code, "context": context})
+        return [{"role": "system", "content": SYSTEM_PROMPTS[mode]}, {"role": "user", "content": user_message}]
+
+    @staticmethod
+    def _parse_response(response) -> Tuple[str, Dict[str, int]]:
+        result = response.choices[0].message.content
+        if not result:
+            raise APIError("Received empty response from API")
+        tokens = {"input": response.usage.prompt_tokens if response.usage else 0, "output": response.usage.completion_tokens if response.usage else 0}
+        return result, tokens
+
+    def analyze_code_stream(self, code: str, language: str, mode: ReviewMode, context: str = "", model: str = DEFAULT_MODEL, max_tokens: int = DEFAULT_MAX_TOKENS, temperature: float = DEFAULT_TEMPERATURE, usage: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """Yield the response text as it is generated; token usage from the final chunk is written into `usage`."""
+        received = False
+        try:
+            stream = self._client.chat.completions.create(
                 model=model,
-                messages=[{"role": "system", "content": SYSTEM_PROMPTS[mode]}, {"role": "user", "content": user_message}],
+                messages=self._build_messages(code, language, mode, context),
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
             )
-            result = response.choices[0].message.content
-            if not result:
-                raise APIError("Received empty response from API")
-            tokens = {"input": response.usage.prompt_tokens if response.usage else 0, "output": response.usage.completion_tokens if response.usage else 0}
-            return result, tokens
+            for chunk in stream:
+                if chunk.usage and usage is not None:
+                    usage["input"] = chunk.usage.prompt_tokens
+                    usage["output"] = chunk.usage.completion_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    received = True
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            error_msg = str(e).lower()
-            if "authentication" in error_msg or "invalid" in error_msg or "api key" in error_msg:
-                raise AuthenticationError("Authentication failed. Please check your OpenRouter API key.")
-            elif "rate limit" in error_msg:
-                raise RateLimitError("Rate limit exceeded. Please wait a moment and try again.")
-            elif "quota" in error_msg or "billing" in error_msg or "credit" in error_msg:
-                raise QuotaExceededError("Quota exceeded. Please check your OpenRouter account credits.")
-            elif "timeout" in error_msg:
-                raise TimeoutError("Request timed out. Please try again.")
-            else:
-                raise APIError(f"Error: {str(e)}. Please try again or check your connection.")
+            raise _classify_api_error(e)
+        if not received:
+            raise APIError("Received empty response from API")
+
+    def analyze_files(self, files: List[Tuple[str, str]], mode: ReviewMode, context: str = "", model: str = DEFAULT_MODEL, max_tokens: int = DEFAULT_MAX_TOKENS, temperature: float = DEFAULT_TEMPERATURE) -> List[Union[Tuple[str, Dict[str, int]], BaseException]]:
+        """Analyze each (code, language) pair under one mode concurrently; results follow the order of `files`.
+
+        A file whose request fails yields its exception in place, so the other reviews are kept.
+        """
+        jobs = [(code, language, mode) for code, language in files]
+        return asyncio.run(self._gather(jobs, context, model, max_tokens, temperature))
+
+    async def _gather(self, jobs: List[Tuple[str, str, ReviewMode]], context: str, model: str, max_tokens: int, temperature: float) -> List[Union[Tuple[str, Dict[str, int]], BaseException]]:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # The async client is bound to the event loop created by asyncio.run, so it lives for one batch only.
+        async with AsyncOpenAI(api_key=self._api_key, base_url=OPENROUTER_BASE_URL) as client:
+            return list(await asyncio.gather(*[self._analyze_one(client, semaphore, code, language, mode, context, model, max_tokens, temperature) for code, language, mode in jobs], return_exceptions=True))
+
+    async def _analyze_one(self, client: AsyncOpenAI, semaphore: asyncio.Semaphore, code: str, language: str, mode: ReviewMode, context: str, model: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, int]]:
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=self._build_messages(code, language, mode, context),
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            except Exception as e:
+                raise _classify_api_error(e)
+        return self._parse_response(response)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_CLIENTS)
+def get_client(api_key: str) -> OpenRouterClient:
+    """Return a client per API key so its connection pool survives reruns."""
+    return OpenRouterClient(api_key)
 
 
 SYSTEM_PROMPTS = {
@@ -444,29 +507,30 @@ def init_session_state() -> None:
     SessionStateManager.init()
 
 
+def _is_reviewable_file(name: str) -> bool:
+    """Name and suffix filter shared by the upload and ZIP ingest paths."""
+    return name not in IGNORE_FILES and PurePosixPath(name).suffix.lower() in SUPPORTED_SUFFIXES
+
+
 def scan_project_files(uploaded_files: List) -> Tuple[Dict[str, str], List[str]]:
     files_content = {}
     errors = []
     total_size = 0
     for uploaded_file in uploaded_files:
         try:
-            file_size = len(uploaded_file.getvalue())
-            total_size += file_size
-            if total_size > MAX_PROJECT_SIZE:
-                errors.append(f"Total size exceeds {MAX_PROJECT_SIZE // 1024}KB limit")
-                break
+            if not _is_reviewable_file(uploaded_file.name):
+                continue
             if len(files_content) >= MAX_PROJECT_FILES:
                 errors.append(f"Maximum {MAX_PROJECT_FILES} files limit reached")
                 break
-            if uploaded_file.name in IGNORE_FILES:
-                continue
-            ext = Path(uploaded_file.name).suffix.lower()
-            if ext.lstrip('.') not in SUPPORTED_FILE_TYPES:
-                continue
+            # UploadedFile.size is known up front, so oversized uploads are rejected before being read.
+            total_size += uploaded_file.size
+            if total_size > MAX_PROJECT_SIZE:
+                errors.append(f"Total size exceeds {MAX_PROJECT_SIZE // 1024}KB limit")
+                break
+            data = uploaded_file.getvalue()
             try:
-                content = uploaded_file.read().decode("utf-8")
-                uploaded_file.seek(0)
-                files_content[uploaded_file.name] = content
+                files_content[uploaded_file.name] = data.decode("utf-8")
             except UnicodeDecodeError:
                 errors.append(f"Could not read {uploaded_file.name} (not UTF-8)")
         except Exception as e:
@@ -474,37 +538,72 @@ def scan_project_files(uploaded_files: List) -> Tuple[Dict[str, str], List[str]]
     return files_content, errors
 
 
+def _read_zip_entry(zf: zipfile.ZipFile, file_info: zipfile.ZipInfo, max_bytes: int) -> Optional[Tuple[Optional[str], int]]:
+    """Decode a ZIP member in chunks.
+
+    Returns None as soon as the member exceeds max_bytes, and a None content if it is not UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = []
+    bytes_read = 0
+    try:
+        with zf.open(file_info) as f:
+            while chunk := f.read(ZIP_READ_CHUNK_SIZE):
+                bytes_read += len(chunk)
+                if bytes_read > max_bytes:
+                    return None
+                chunks.append(decoder.decode(chunk))
+        chunks.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
+        return None, bytes_read
+    return "".join(chunks), bytes_read
+
+
 def extract_zip_files(zip_file) -> Tuple[Dict[str, str], List[str]]:
     files_content = {}
     errors = []
-    total_size = 0
+    size_error = f"Total size exceeds {MAX_PROJECT_SIZE // 1024}KB limit"
     try:
-        with zipfile.ZipFile(io.BytesIO(zip_file.getvalue()), 'r') as zf:
+        with zipfile.ZipFile(zip_file, 'r') as zf:
+            entries = []
+            declared_size = 0
             for file_info in zf.infolist():
                 if file_info.is_dir():
                     continue
-                path_parts = Path(file_info.filename).parts
-                if any(part in IGNORE_DIRS for part in path_parts):
-                    continue
-                filename = Path(file_info.filename).name
-                if filename in IGNORE_FILES or filename.startswith('.'):
+                # ZIP member names always use forward slashes, so parse them once as POSIX paths.
+                member_path = PurePosixPath(file_info.filename)
+                if any(part in IGNORE_DIRS for part in member_path.parts):
                     continue
-                ext = Path(filename).suffix.lower()
-                if ext.lstrip('.') not in SUPPORTED_FILE_TYPES:
+                if member_path.name.startswith('.') or not _is_reviewable_file(member_path.name):
                     continue
-                total_size += file_info.file_size
-                if total_size > MAX_PROJECT_SIZE:
-                    errors.append(f"Total size exceeds {MAX_PROJECT_SIZE // 1024}KB limit")
-                    break
-                if len(files_content) >= MAX_PROJECT_FILES:
+                if len(entries) >= MAX_PROJECT_FILES:
                     errors.append(f"Maximum {MAX_PROJECT_FILES} files limit reached")
                     break
-                try:
-                    with zf.open(file_info.filename) as f:
-                        content = f.read().decode("utf-8")
-                        files_content[file_info.filename] = content
-                except UnicodeDecodeError:
+                # The central directory already lists sizes; stop before opening anything past the cap.
+                declared_size += file_info.file_size
+                if declared_size > MAX_PROJECT_SIZE:
+                    errors.append(size_error)
+                    break
+                entries.append(file_info)
+
+            # Members are inflated and decoded in parallel (ZipFile serializes the raw reads itself);
+            # the size budget is then applied in archive order so the accepted files are deterministic.
+            with ThreadPoolExecutor(max_workers=max(1, min(ZIP_READ_WORKERS, len(entries)))) as executor:
+                results = list(executor.map(lambda info: _read_zip_entry(zf, info, MAX_PROJECT_SIZE), entries))
+
+            total_size = 0
+            for file_info, entry in zip(entries, results):
+                if entry is not None and entry[0] is None:
                     errors.append(f"Could not read {file_info.filename} (not UTF-8)")
+                    continue
+                # Sizes are also counted from the decompressed stream, in case the headers understate them.
+                if entry is None or total_size + entry[1] > MAX_PROJECT_SIZE:
+                    if size_error not in errors:
+                        errors.append(size_error)
+                    break
+                content, file_size = entry
+                total_size += file_size
+                files_content[file_info.filename] = content
     except zipfile.BadZipFile:
         errors.append("Invalid or corrupted zip file")
     except Exception as e:
@@ -512,23 +611,38 @@ def extract_zip_files(zip_file) -> Tuple[Dict[str, str], List[str]]:
     return files_content, errors
 
 
-def format_project_for_review(files_content: Dict[str, str]) -> str:
-    parts = [f"# Project Analysis Request\n**Total Files:** {len(files_content)}\n---\n"]
+def _count_lines(content: str) -> int:
+    if not content:
+        return 0
+    return content.count('\n') + (0 if content.endswith('\n') else 1)
+
+
+def _precompute_stats(files_content: Dict[str, str]) -> Dict[str, Tuple[int, int, str]]:
+    """Compute (lines, chars, extension) per file once so project helpers can share it."""
+    return {filepath: (_count_lines(content), len(content), Path(filepath).suffix.lower()) for filepath, content in files_content.items()}
+
+
+def format_project_for_review(files_content: Dict[str, str], file_stats: Optional[Dict[str, Tuple[int, int, str]]] = None) -> str:
+    if file_stats is None:
+        file_stats = _precompute_stats(files_content)
+    buf = io.StringIO()
+    buf.write(f"# Project Analysis Request\n**Total Files:** {len(files_content)}\n---\n")
     for filepath, content in sorted(files_content.items()):
-        ext = Path(filepath).suffix.lower()
+        lines, _, ext = file_stats[filepath]
         lang = EXTENSION_TO_LANGUAGE.get(ext, "text")
-        lines = len(content.split('\n'))
-        parts.append(f"\n## File: `{filepath}`\n**Language:** {lang} | **Lines:** {lines}\n```{lang}\n{content}\n```\n")
-    return "\n".join(parts)
+        # Write the file body separately so it is copied once, into the buffer only.
+        buf.write(f"\n\n## File: `{filepath}`\n**Language:** {lang} | **Lines:** {lines}\n```{lang}\n")
+        buf.write(content)
+        buf.write("\n```\n")
+    return buf.getvalue()
 
 
-def get_project_stats(files_content: Dict[str, str]) -> Dict:
+def get_project_stats(files_content: Dict[str, str], file_stats: Optional[Dict[str, Tuple[int, int, str]]] = None) -> Dict:
+    if file_stats is None:
+        file_stats = _precompute_stats(files_content)
     stats = {"total_files": len(files_content), "total_lines": 0, "total_chars": 0, "languages": {}, "files_by_type": {}}
-    for filepath, content in files_content.items():
-        ext = Path(filepath).suffix.lower()
+    for lines, chars, ext in file_stats.values():
         lang = EXTENSION_TO_LANGUAGE.get(ext, "other")
-        lines = len(content.split('\n'))
-        chars = len(content)
         stats["total_lines"] += lines
         stats["total_chars"] += chars
         stats["languages"][lang] = stats["languages"].get(lang, 0) + 1
@@ -537,8 +651,8 @@ def get_project_stats(files_content: Dict[str, str]) -> Dict:
 
 
 def calculate_cost(input_tokens: int, output_tokens: int, model: str) -> float:
-    costs = MODEL_COSTS.get(model, MODEL_COSTS[DEFAULT_MODEL])
-    return (input_tokens / 1_000_000) * costs["input"] + (output_tokens / 1_000_000) * costs["output"]
+    input_cost, output_cost = COST_PER_TOKEN.get(model, COST_PER_TOKEN[DEFAULT_MODEL])
+    return input_tokens * input_cost + output_tokens * output_cost
 
 
 def estimate_cost(code_length: int, model: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Dict[str, float]:
@@ -548,18 +662,12 @@ def estimate_cost(code_length: int, model: str, max_tokens: int = DEFAULT_MAX_TO
 
 
 def get_model_cost_info(model: str) -> str:
-    costs = MODEL_COSTS.get(model)
-    if not costs:
-        return "Cost: Unknown"
-    est_1k_cost = ((1000 / 1_000_000) * costs["input"]) + ((500 / 1_000_000) * costs["output"])
-    return f"~${est_1k_cost:.4f}/1K tokens" if est_1k_cost >= 0.001 else f"~${est_1k_cost*1000:.2f}/1K tokens"
+    return MODEL_COST_INFO.get(model, "Cost: Unknown")
 
 
+@functools.lru_cache(maxsize=128)
 def detect_language_from_extension(filename: str) -> Optional[str]:
-    for ext, lang in EXTENSION_TO_LANGUAGE.items():
-        if filename.lower().endswith(ext):
-            return lang
-    return None
+    return EXTENSION_TO_LANGUAGE.get(Path(filename).suffix.lower())
 
 
 def add_to_history(code_snippet: str, language: str, mode: ReviewMode, result: str, tokens: Dict[str, int], cost: float, model: str) -> None:
@@ -572,9 +680,9 @@ def add_to_history(code_snippet: str, language: str, mode: ReviewMode, result: s
 
 
 def validate_api_key(api_key: str) -> Tuple[bool, Optional[str]]:
-    if not api_key or not api_key.strip():
+    api_key = api_key.strip() if api_key else ""
+    if not api_key:
         return False, "API key cannot be empty"
-    api_key = api_key.strip()
     if not api_key.startswith("sk-or-"):
         return False, "OpenRouter API key should start with 'sk-or-'"
     if len(api_key) < 30:
@@ -583,8 +691,11 @@ def validate_api_key(api_key: str) -> Tuple[bool, Optional[str]]:
 
 
 def validate_code_input(code: str) -> Tuple[bool, Optional[str]]:
-    if not code or not code.strip():
+    if not code or code.isspace():
         return False, "Code input cannot be empty"
+    # Without surrounding whitespace the raw length is the stripped length, so skip the copy.
+    if MIN_CODE_LENGTH <= len(code) <= MAX_CODE_LENGTH and not code[0].isspace() and not code[-1].isspace():
+        return True, None
     code = code.strip()
     if len(code) < MIN_CODE_LENGTH:
         return False, f"Code is too short (minimum {MIN_CODE_LENGTH} characters)"
@@ -594,7 +705,7 @@ def validate_code_input(code: str) -> Tuple[bool, Optional[str]]:
 
 
 def render_header() -> None:
-    st.markdown(f'<p class="main-header">{icon(Icons.TERMINAL, "1em")} AI Pair Engineer</p>', unsafe_allow_html=True)
+    st.markdown(f'<p class="main-header">{_ICON_TERMINAL} AI Pair Engineer</p>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Intelligent code analysis powered by multiple LLM providers</p>', unsafe_allow_html=True)
     st.divider()
 
@@ -793,36 +904,48 @@ def _render_language_context() -> Tuple[str, str]:
     return language, context
 
 
+# Model picker options never change at runtime, so they are built once at import.
+_PROVIDERS = tuple(MODEL_GROUPS)
+_PROVIDER_MODEL_OPTIONS = {
+    provider: tuple(f"{MODEL_DISPLAY_NAMES.get(m, m.split('/')[-1])} ({get_model_cost_info(m)})" for m in MODEL_GROUPS[provider])
+    for provider in _PROVIDERS
+}
+_OPTION_TO_MODEL = {provider: dict(zip(_PROVIDER_MODEL_OPTIONS[provider], MODEL_GROUPS[provider])) for provider in _PROVIDERS}
+_PROVIDER_DEFAULT_INDEX = {
+    provider: MODEL_GROUPS[provider].index(DEFAULT_MODEL) if DEFAULT_MODEL in MODEL_GROUPS[provider] else 0
+    for provider in _PROVIDERS
+}
+
+
 def _render_model_settings() -> Tuple[str, int, float]:
-    st.markdown(f"### {icon(Icons.SETTINGS, '1em')} Advanced Settings", unsafe_allow_html=True)
-    selected_provider = st.selectbox("Provider", list(MODEL_GROUPS.keys()), index=0)
-    provider_models = MODEL_GROUPS[selected_provider]
-    model_options = [f"{MODEL_DISPLAY_NAMES.get(m, m.split('/')[-1])} ({get_model_cost_info(m)})" for m in provider_models]
-    default_idx = provider_models.index(DEFAULT_MODEL) if DEFAULT_MODEL in provider_models else 0
-    selected_display = st.selectbox("Model", model_options, index=default_idx)
-    model = provider_models[model_options.index(selected_display)]
+    st.markdown(f"### {_ICON_SETTINGS} Advanced Settings", unsafe_allow_html=True)
+    selected_provider = st.selectbox("Provider", _PROVIDERS, index=0)
+    selected_display = st.selectbox("Model", _PROVIDER_MODEL_OPTIONS[selected_provider], index=_PROVIDER_DEFAULT_INDEX[selected_provider])
+    model = _OPTION_TO_MODEL[selected_provider][selected_display]
     max_tokens = st.slider("Max Tokens", 1000, 8000, DEFAULT_MAX_TOKENS, 500)
     temperature = st.slider("Temperature", 0.0, 1.0, DEFAULT_TEMPERATURE, 0.1)
     return model, max_tokens, temperature
 
 
 def _render_cost_tracker() -> None:
-    st.markdown(f"### {icon(Icons.DOLLAR, '1em')} Session Cost Tracker", unsafe_allow_html=True)
-    tokens = SessionStateManager.get_tokens()
-    total_cost = SessionStateManager.get_cost()
+    st.markdown(f"### {_ICON_DOLLAR} Session Cost Tracker", unsafe_allow_html=True)
+    input_tokens, output_tokens, total_cost = SessionStateManager.get_usage()
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Input Tokens", f"{tokens.get('input', 0):,}")
+        st.metric("Input Tokens", f"{input_tokens:,}")
     with col2:
-        st.metric("Output Tokens", f"{tokens.get('output', 0):,}")
+        st.metric("Output Tokens", f"{output_tokens:,}")
     st.metric("Total Cost", f"${total_cost:.4f}")
+    cache_stats = SessionStateManager.get_cache_stats()
+    if cache_stats["hits"] or cache_stats["misses"]:
+        st.caption(f"Response cache: **{cache_stats['hits']}** hits / **{cache_stats['misses']}** misses")
     if st.button("Reset Cost Tracker", key="reset_cost", use_container_width=True):
         SessionStateManager.reset_cost_tracker()
         st.rerun()
 
 
 def _render_sidebar_footer() -> None:
-    st.markdown(f"### {icon(Icons.INFO, '1em')} Tips\n- Upload files or paste code\n- Use **auto-detect** for files\n- Add context for better feedback", unsafe_allow_html=True)
+    st.markdown(f"### {_ICON_INFO} Tips\n- Upload files or paste code\n- Use **auto-detect** for files\n- Add context for better feedback", unsafe_allow_html=True)
     st.divider()
     if st.button("Clear All Results", key="clear_results", use_container_width=True):
         SessionStateManager.clear_all_results()
@@ -832,7 +955,7 @@ def _render_sidebar_footer() -> None:
 
 def render_sidebar() -> Tuple[str, str, str, str, int, float]:
     with st.sidebar:
-        st.markdown(f"## {icon(Icons.GEAR, '1em')} Configuration", unsafe_allow_html=True)
+        st.markdown(f"## {_ICON_GEAR} Configuration", unsafe_allow_html=True)
         api_key = _render_api_key_input()
         st.divider()
         language, context = _render_language_context()
@@ -846,25 +969,28 @@ def render_sidebar() -> Tuple[str, str, str, str, int, float]:
 
 
 def render_code_input() -> Tuple[str, Optional[str]]:
-    st.markdown(f"### {icon(Icons.FILE, '1em')} Your Code", unsafe_allow_html=True)
+    st.markdown(f"### {_ICON_FILE} Your Code", unsafe_allow_html=True)
     uploaded_file = st.file_uploader("Upload a code file", type=SUPPORTED_FILE_TYPES)
     detected_language = None
     file_just_uploaded = False
     if uploaded_file is not None:
-        file_size = len(uploaded_file.getvalue())
+        file_size = uploaded_file.size
         if file_size > 500 * 1024:
             st.error(f"File too large ({file_size / 1024:.1f}KB). Maximum size is 500KB.")
         else:
             try:
-                file_content = uploaded_file.read().decode("utf-8")
-                # Check if this is a new file upload
-                if st.session_state.get("code_input", "") != file_content:
-                    st.session_state["code_input"] = file_content
+                # file_id changes with each new upload, so the file is only read when it is new
+                if st.session_state.get("code_upload_id") != uploaded_file.file_id:
+                    st.session_state["code_input"] = uploaded_file.getvalue().decode("utf-8")
+                    st.session_state["code_upload_id"] = uploaded_file.file_id
                     file_just_uploaded = True
                 detected_language = detect_language_from_extension(uploaded_file.name)
                 st.success(f"Loaded `{uploaded_file.name}`" + (f" - Detected: **{detected_language}**" if detected_language else ""))
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
+    else:
+        # Forget the last upload so re-attaching the same file loads it again
+        st.session_state.pop("code_upload_id", None)
     st.markdown("**Or paste your code below:**")
     code_input = st.text_area("Paste your code here", height=350, placeholder="Paste your code here...", label_visibility="collapsed", value=st.session_state.get("code_input", ""), key="code_text_area")
     # Use session state value if file was just uploaded (text_area may have stale value)
@@ -873,7 +999,7 @@ def render_code_input() -> Tuple[str, Optional[str]]:
     elif code_input != st.session_state.get("code_input", ""):
         st.session_state["code_input"] = code_input
     if code_input:
-        st.caption(f"**{len(code_input.split(chr(10)))}** lines | **{len(code_input):,}** characters")
+        st.caption(f"**{_count_lines(code_input)}** lines | **{len(code_input):,}** characters")
     
     st.markdown("""
     <style>
@@ -959,8 +1085,8 @@ def render_code_input() -> Tuple[str, Optional[str]]:
     return code_input, detected_language
 
 
-def render_project_input() -> Tuple[Dict[str, str], List[str]]:
-    st.markdown(f"### {icon(Icons.FOLDER, '1em')} Your Project", unsafe_allow_html=True)
+def render_project_input() -> Tuple[Dict[str, str], List[str], Dict[str, Tuple[int, int, str]]]:
+    st.markdown(f"### {_ICON_FOLDER} Your Project", unsafe_allow_html=True)
 
     upload_option = st.radio("Upload method:", ["Multiple Files", "ZIP Archive"], horizontal=True, key="project_upload_method")
     project_files = {}
@@ -978,10 +1104,11 @@ def render_project_input() -> Tuple[Dict[str, str], List[str]]:
     for error in upload_errors:
         st.warning(error)
 
+    file_stats = _precompute_stats(project_files)
     if project_files:
-        stats = get_project_stats(project_files)
+        stats = get_project_stats(project_files, file_stats)
         st.markdown("---")
-        st.markdown(f"### {icon(Icons.CHART, '1em', '#10b981')} Project Statistics", unsafe_allow_html=True)
+        st.markdown(f"### {_ICON_CHART_GREEN} Project Statistics", unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Files", stats["total_files"])
@@ -994,26 +1121,27 @@ def render_project_input() -> Tuple[Dict[str, str], List[str]]:
             st.markdown(f"**Languages:** {', '.join([f'{l}: {c}' for l, c in sorted(stats['languages'].items())])}")
 
         with st.expander(f"View {len(project_files)} files"):
-            for fp in sorted(project_files.keys()):
-                ext = Path(fp).suffix.lower()
-                lang = EXTENSION_TO_LANGUAGE.get(ext, "text")
-                st.markdown(f"- `{fp}` ({lang}, {len(project_files[fp].split(chr(10)))} lines)")
+            # One markdown element for the whole list instead of one delta per file.
+            st.markdown("\n".join(
+                f"- `{fp}` ({EXTENSION_TO_LANGUAGE.get(file_stats[fp][2], 'text')}, {file_stats[fp][0]} lines)"
+                for fp in sorted(project_files)
+            ))
 
         if st.button("Clear Project", use_container_width=True):
             st.session_state.pop("project_files_uploader", None)
             st.session_state.pop("project_zip_uploader", None)
             st.rerun()
     else:
-        st.markdown(f"{icon(Icons.INFO, '1em', '#58a6ff')} Upload project files or a ZIP archive to analyze.", unsafe_allow_html=True)
+        st.markdown(f"{_ICON_INFO_BLUE} Upload project files or a ZIP archive to analyze.", unsafe_allow_html=True)
 
-    return project_files, upload_errors
+    return project_files, upload_errors, file_stats
 
 
 def render_history() -> None:
     history = SessionStateManager.get_history()
     if not history:
         return
-    st.markdown(f"### {icon(Icons.HISTORY, '1em')} Session History", unsafe_allow_html=True)
+    st.markdown(f"### {_ICON_HISTORY} Session History", unsafe_allow_html=True)
     for i, entry in enumerate(history):
         with st.expander(f"{entry['timestamp']} | {entry['mode']} | {entry['language']} | ${entry['cost']:.4f}"):
             st.markdown(f"**Code Preview:**\n```\n{entry['code_preview']}\n```")
@@ -1041,13 +1169,19 @@ def _get_mode_description(mode: ReviewMode) -> str:
 def _execute_analysis(api_key: str, code_input: str, language: str, mode: ReviewMode, context: str, model: str, max_tokens: int, temperature: float) -> None:
     with st.spinner(f"Analyzing code for {mode.value.lower()}..."):
         try:
-            client = OpenRouterClient(api_key)
-            result, tokens = client.analyze_code(code_input, language, mode, context, model, max_tokens, temperature)
-            SessionStateManager.set_result(mode.name, result)
-            cost = calculate_cost(tokens.get("input", 0), tokens.get("output", 0), model)
-            SessionStateManager.add_tokens(tokens.get("input", 0), tokens.get("output", 0))
-            SessionStateManager.add_cost(cost)
-            add_to_history(code_input, language, mode, result, tokens, cost, model)
+            cache_key = llm_cache.make_key(model, mode.name, SYSTEM_PROMPTS[mode], temperature, max_tokens, language, code_input, context) if llm_cache.is_cacheable(temperature) else None
+            cached = llm_cache.get(cache_key) if cache_key else None
+            if cached:
+                result, tokens = cached["result"], {"input": 0, "output": 0}
+            else:
+                tokens = {"input": 0, "output": 0}
+                stream = get_client(api_key).analyze_code_stream(code_input, language, mode, context, model, max_tokens, temperature, usage=tokens)
+                result = st.empty().write_stream(stream)
+                if cache_key:
+                    llm_cache.set(cache_key, result)
+            if cache_key:
+                SessionStateManager.record_cache_lookup(hit=cached is not None)
+            _store_analysis(code_input, language, mode, result, tokens, model, from_cache=cached is not None)
             st.rerun()
         except (AuthenticationError, RateLimitError, QuotaExceededError, TimeoutError, APIError) as e:
             st.error(str(e))
@@ -1055,6 +1189,40 @@ def _execute_analysis(api_key: str, code_input: str, language: str, mode: Review
             st.error(f"Unexpected error: {str(e)}")
 
 
+def _execute_per_file_analysis(api_key: str, project_files: Dict[str, str], file_stats: Dict[str, Tuple[int, int, str]], context: str, model: str, max_tokens: int, temperature: float) -> None:
+    paths = sorted(project_files)
+    with st.spinner(f"Reviewing {len(paths)} files in parallel..."):
+        try:
+            files = [(project_files[path], EXTENSION_TO_LANGUAGE.get(file_stats[path][2], "text")) for path in paths]
+            results = get_client(api_key).analyze_files(files, ReviewMode.FULL_REVIEW, context, model, max_tokens, temperature)
+            succeeded = [r for r in results if not isinstance(r, BaseException)]
+            if not succeeded:
+                raise results[0]
+            # Reviews that finished were billed, so they are kept and counted even if other files failed.
+            sections = []
+            for path, result in zip(paths, results):
+                if isinstance(result, BaseException):
+                    sections.append(f"# File: `{path}`\n\n> Review failed: {result}")
+                else:
+                    sections.append(f"# File: `{path}`\n\n{result[0]}")
+            report = "\n\n---\n\n".join(sections)
+            tokens = {"input": sum(t.get("input", 0) for _, t in succeeded), "output": sum(t.get("output", 0) for _, t in succeeded)}
+            _store_analysis("\n".join(paths), "multi-language", ReviewMode.PROJECT_REVIEW, report, tokens, model)
+            st.rerun()
+        except (AuthenticationError, RateLimitError, QuotaExceededError, TimeoutError, APIError) as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Unexpected error: {str(e)}")
+
+
+def _store_analysis(code_input: str, language: str, mode: ReviewMode, result: str, tokens: Dict[str, int], model: str, from_cache: bool = False) -> None:
+    SessionStateManager.set_result(mode.name, result, from_cache=from_cache)
+    cost = calculate_cost(tokens.get("input", 0), tokens.get("output", 0), model)
+    SessionStateManager.add_tokens(tokens.get("input", 0), tokens.get("output", 0))
+    SessionStateManager.add_cost(cost)
+    add_to_history(code_input, language, mode, result, tokens, cost, model)
+
+
 def _render_mode_result(mode: ReviewMode) -> None:
     """Render analysis results with enhanced styling."""
     result = SessionStateManager.get_result(mode.name)
@@ -1072,6 +1240,9 @@ def _render_mode_result(mode: ReviewMode) -> None:
         </div>
         """, unsafe_allow_html=True)
         
+        if SessionStateManager.is_cached_result(mode.name):
+            st.caption("Served from cache - no tokens were billed for this result.")
+
         # Result content
         st.markdown(result)
         
@@ -1095,10 +1266,10 @@ def _render_mode_result(mode: ReviewMode) -> None:
 def _resolve_language(language: str, detected_language: Optional[str]) -> str:
     if language == "auto-detect":
         if detected_language:
-            st.markdown(f"{icon(Icons.INFO, '1em', '#58a6ff')} Auto-detected: **{detected_language}**", unsafe_allow_html=True)
+            st.markdown(f"{_ICON_INFO_BLUE} Auto-detected: **{detected_language}**", unsafe_allow_html=True)
             return detected_language
         else:
-            st.markdown(f"{icon(Icons.WARNING, '1em', '#f59e0b')} Could not auto-detect. Defaulting to Python.", unsafe_allow_html=True)
+            st.markdown(f"{_ICON_WARNING_AMBER} Could not auto-detect. Defaulting to Python.", unsafe_allow_html=True)
             return "python"
     return language
 
@@ -1141,83 +1312,6 @@ def render_review_tabs(code_input: str, api_key: str, language: str, context: st
     default_idx = mode_names.index(saved_mode) if saved_mode in mode_names else 4
     selected_mode = modes[default_idx]
 
-    st.markdown("""<style>
-    .review-mode-card {
-        background: var(--bg-card);
-        border: 1px solid var(--border-primary);
-        border-radius: var(--radius-lg);
-        padding: 1.5rem;
-        margin: 1rem 0;
-        transition: all var(--transition-normal);
-    }
-
-    .review-mode-card:hover {
-        border-color: var(--accent-primary);
-        box-shadow: var(--shadow-md);
-    }
-
-    .cost-badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        background: rgba(16, 185, 129, 0.1);
-        border: 1px solid rgba(16, 185, 129, 0.3);
-        border-radius: var(--radius-md);
-        padding: 0.5rem 1rem;
-        color: var(--accent-secondary);
-        font-weight: 600;
-        font-size: 0.9rem;
-        margin: 0.75rem 0;
-    }
-
-    .mode-header {
-        display: flex;
-        align-items: center;
-        gap: 0.75rem;
-        margin-bottom: 0.5rem;
-    }
-
-    .mode-description {
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-        margin-bottom: 1rem;
-        line-height: 1.5;
-    }
-    </style>""", unsafe_allow_html=True)
-
-    st.markdown("""
-    <style>
-    /* Enhanced mode dropdown styling */
-    .mode-select-container {
-        margin-bottom: 1rem;
-    }
-
-    .mode-select-container .stSelectbox > div > div {
-        background: var(--bg-card) !important;
-        border: 2px solid var(--border-primary) !important;
-        border-radius: var(--radius-lg) !important;
-        padding: 0.25rem !important;
-        transition: all 0.25s ease !important;
-    }
-
-    .mode-select-container .stSelectbox > div > div:hover {
-        border-color: var(--accent-primary) !important;
-        box-shadow: var(--shadow-md) !important;
-    }
-
-    .mode-select-container .stSelectbox > div > div:focus-within {
-        border-color: var(--accent-primary) !important;
-        box-shadow: 0 0 0 3px rgba(88, 166, 255, 0.15), var(--shadow-md) !important;
-    }
-
-    /* Dropdown option styling */
-    .mode-select-container .stSelectbox [data-baseweb="select"] > div {
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     # Mode options with emojis for dropdown
     mode_options = {
         "🔍 Design Flaws — Detect SOLID violations and code smells": ReviewMode.DESIGN_FLAWS,
@@ -1283,50 +1377,125 @@ def render_review_tabs(code_input: str, api_key: str, language: str, context: st
     _render_mode_result(selected_mode)
 
 
-def render_project_review(project_files: Dict[str, str], api_key: str, context: str, model: str, max_tokens: int, temperature: float) -> None:
-    st.markdown(f"### {icon('bullseye', '1em')} Project Analysis", unsafe_allow_html=True)
+def render_project_review(project_files: Dict[str, str], api_key: str, context: str, model: str, max_tokens: int, temperature: float, file_stats: Optional[Dict[str, Tuple[int, int, str]]] = None) -> None:
+    st.markdown(f"### {_ICON_BULLSEYE} Project Analysis", unsafe_allow_html=True)
 
     if not project_files:
-        st.markdown(f"{icon(Icons.INFO, '1em', '#58a6ff')} Upload project files on the left to begin analysis.", unsafe_allow_html=True)
+        st.markdown(f"{_ICON_INFO_BLUE} Upload project files on the left to begin analysis.", unsafe_allow_html=True)
         return
 
     st.markdown(f"**{ReviewMode.PROJECT_REVIEW.value}**")
     st.caption(_get_mode_description(ReviewMode.PROJECT_REVIEW))
 
-    formatted_content = format_project_for_review(project_files)
-    cost_estimate = estimate_cost(len(formatted_content), model, max_tokens)
-    st.markdown(f"{icon(Icons.DOLLAR, '1em', '#10b981')} Est. cost: **${cost_estimate['cost']:.4f}** (~{cost_estimate['input_tokens']:,} in + ~{cost_estimate['output_tokens']:,} out)", unsafe_allow_html=True)
+    if file_stats is None:
+        file_stats = _precompute_stats(project_files)
+    per_file = st.checkbox("Review each file separately", key="project_per_file", help="Sends one request per file in parallel instead of a single combined prompt. Useful when the project is too large for the model's context window.")
+
+    if per_file:
+        estimates = [estimate_cost(chars, model, max_tokens) for _, chars, _ in file_stats.values()]
+        cost_estimate = {key: sum(e[key] for e in estimates) for key in ("input_tokens", "output_tokens", "cost")}
+    else:
+        formatted_content = format_project_for_review(project_files, file_stats)
+        cost_estimate = estimate_cost(len(formatted_content), model, max_tokens)
+    st.markdown(f"{_ICON_DOLLAR_GREEN} Est. cost: **${cost_estimate['cost']:.4f}** (~{cost_estimate['input_tokens']:,} in + ~{cost_estimate['output_tokens']:,} out)", unsafe_allow_html=True)
 
     if st.button("Analyze Project", key="btn_PROJECT_REVIEW", type="primary", use_container_width=True):
         is_valid_key, key_error = validate_api_key(api_key)
         if not is_valid_key:
             st.error(key_error)
+        elif per_file:
+            _execute_per_file_analysis(api_key, project_files, file_stats, context, model, max_tokens, temperature)
         else:
             _execute_analysis(api_key, formatted_content, "multi-language", ReviewMode.PROJECT_REVIEW, context, model, max_tokens, temperature)
 
     _render_mode_result(ReviewMode.PROJECT_REVIEW)
 
 
+_FOOTER_STAT_TEMPLATE = '<div class="footer-stat"><div class="footer-stat-label">{}</div><div class="footer-stat-value">{}</div></div>'
+_FOOTER_STATIC_STATS = "".join(_FOOTER_STAT_TEMPLATE.format(label, value) for label, value in (("Languages Supported", "15+"), ("Review Modes", "6"), ("Response Time", "~5 sec")))
+
+
 def render_footer() -> None:
     st.divider()
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Languages Supported", "15+")
-    with col2:
-        st.metric("Review Modes", "6")
-    with col3:
-        st.metric("Response Time", "~5 sec")
-    with col4:
-        st.metric("Session Analyses", len(st.session_state.get("history", [])))
+    # A single markdown element replaces four st.metric widgets; only the analysis count changes.
+    session_stat = _FOOTER_STAT_TEMPLATE.format("Session Analyses", len(st.session_state.get("history", [])))
+    st.markdown(f'<div class="footer-stats">{_FOOTER_STATIC_STATS}{session_stat}</div>', unsafe_allow_html=True)
 
 
-def main() -> None:
-    init_session_state()
-    render_header()
-    api_key, language, context, model, max_tokens, temperature = render_sidebar()
+# Static styles for the review tabs and the review type switcher, sent as one block per rerun.
+_STATIC_CSS = """<style>
+    .review-mode-card {
+        background: var(--bg-card);
+        border: 1px solid var(--border-primary);
+        border-radius: var(--radius-lg);
+        padding: 1.5rem;
+        margin: 1rem 0;
+        transition: all var(--transition-normal);
+    }
+
+    .review-mode-card:hover {
+        border-color: var(--accent-primary);
+        box-shadow: var(--shadow-md);
+    }
+
+    .cost-badge {
+        display: inline-flex;
+        align-items: center;
+        gap: 0.5rem;
+        background: rgba(16, 185, 129, 0.1);
+        border: 1px solid rgba(16, 185, 129, 0.3);
+        border-radius: var(--radius-md);
+        padding: 0.5rem 1rem;
+        color: var(--accent-secondary);
+        font-weight: 600;
+        font-size: 0.9rem;
+        margin: 0.75rem 0;
+    }
+
+    .mode-header {
+        display: flex;
+        align-items: center;
+        gap: 0.75rem;
+        margin-bottom: 0.5rem;
+    }
+
+    .mode-description {
+        color: var(--text-secondary);
+        font-size: 0.9rem;
+        margin-bottom: 1rem;
+        line-height: 1.5;
+    }
+
+    /* Enhanced mode dropdown styling */
+    .mode-select-container {
+        margin-bottom: 1rem;
+    }
 
-    # Mode switcher with styled tabs
-    st.markdown("""<style>
+    .mode-select-container .stSelectbox > div > div {
+        background: var(--bg-card) !important;
+        border: 2px solid var(--border-primary) !important;
+        border-radius: var(--radius-lg) !important;
+        padding: 0.25rem !important;
+        transition: all 0.25s ease !important;
+    }
+
+    .mode-select-container .stSelectbox > div > div:hover {
+        border-color: var(--accent-primary) !important;
+        box-shadow: var(--shadow-md) !important;
+    }
+
+    .mode-select-container .stSelectbox > div > div:focus-within {
+        border-color: var(--accent-primary) !important;
+        box-shadow: 0 0 0 3px rgba(88, 166, 255, 0.15), var(--shadow-md) !important;
+    }
+
+    /* Dropdown option styling */
+    .mode-select-container .stSelectbox [data-baseweb="select"] > div {
+        font-weight: 600 !important;
+        font-size: 1rem !important;
+    }
+
+    /* Mode switcher with styled tabs */
     div[data-testid="stHorizontalBlock"] > div:first-child .stRadio > div {
         flex-direction: row; gap: 0; flex-wrap: wrap;
     }
@@ -1343,7 +1512,31 @@ def main() -> None:
         div[data-testid="stHorizontalBlock"] > div:first-child .stRadio > div { flex-direction: column; gap: 0.5rem; }
         div[data-testid="stHorizontalBlock"] > div:first-child .stRadio label { border-radius: 8px !important; }
     }
-    </style>""", unsafe_allow_html=True)
+
+    /* File Review icon - file-code */
+    div[data-testid="stHorizontalBlock"] .stRadio label:first-of-type::before {
+        font-family: "Font Awesome 6 Free";
+        content: "\\f1c9";
+        font-weight: 900;
+        margin-right: 6px;
+        display: inline-block;
+    }
+    /* Project Review icon - folder-open */
+    div[data-testid="stHorizontalBlock"] .stRadio label:last-of-type::before {
+        font-family: "Font Awesome 6 Free";
+        content: "\\f07c";
+        font-weight: 900;
+        margin-right: 6px;
+        display: inline-block;
+    }
+    </style>"""
+
+
+def main() -> None:
+    init_session_state()
+    st.markdown(_STATIC_CSS, unsafe_allow_html=True)
+    render_header()
+    api_key, language, context, model, max_tokens, temperature = render_sidebar()
 
     # Use plain text for radio (Streamlit doesn't support HTML in radio options)
     # Determine default index based on saved preference
@@ -1364,39 +1557,17 @@ def main() -> None:
     if current_mode != st.session_state.get("review_mode", "file"):
         st.session_state.review_mode = current_mode
     
-    # Inject Font Awesome icons via CSS
-    st.markdown("""
-    <style>
-    /* File Review icon - file-code */
-    div[data-testid="stHorizontalBlock"] .stRadio label:first-of-type::before {
-        font-family: "Font Awesome 6 Free";
-        content: "\\f1c9";
-        font-weight: 900;
-        margin-right: 6px;
-        display: inline-block;
-    }
-    /* Project Review icon - folder-open */
-    div[data-testid="stHorizontalBlock"] .stRadio label:last-of-type::before {
-        font-family: "Font Awesome 6 Free";
-        content: "\\f07c";
-        font-weight: 900;
-        margin-right: 6px;
-        display: inline-block;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     is_project_mode = "Project" in review_mode
 
     col1, col2 = st.columns([1, 1], gap="large")
 
     if is_project_mode:
         with col1:
-            project_files, _ = render_project_input()
+            project_files, _, file_stats = render_project_input()
             st.divider()
             render_history()
         with col2:
-            render_project_review(project_files, api_key, context, model, max_tokens, temperature)
+            render_project_review(project_files, api_key, context, model, max_tokens, temperature, file_stats)
     else:
         with col1:
             code_input, detected_language = render_code_input()
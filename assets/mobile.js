@@ -0,0 +1,72 @@
+(function() {
+    // Rendered inside a components.html iframe, so the Streamlit page is the parent window.
+    const win = window.parent;
+    const doc = win.document;
+
+    function setupMobileSidebar() {
+        const isMobile = win.innerWidth <= 768;
+        const sidebar = doc.querySelector('[data-testid="stSidebar"]');
+        const toggleButton = doc.querySelector('button[data-testid="baseButton-header"]');
+
+        if (isMobile && sidebar) {
+            let overlay = doc.querySelector('.sidebar-overlay');
+            if (!overlay) {
+                overlay = doc.createElement('div');
+                overlay.className = 'sidebar-overlay';
+                doc.body.appendChild(overlay);
+            }
+
+            if (toggleButton) {
+                toggleButton.style.display = 'flex';
+                toggleButton.style.zIndex = '1000';
+                toggleButton.style.position = 'fixed';
+                toggleButton.style.top = '1rem';
+                toggleButton.style.left = '1rem';
+            }
+
+            function updateOverlay() {
+                const isExpanded = sidebar.getAttribute('aria-expanded') === 'true';
+                if (isExpanded) {
+                    overlay.classList.add('active');
+                    doc.body.style.overflow = 'hidden';
+                } else {
+                    overlay.classList.remove('active');
+                    doc.body.style.overflow = '';
+                }
+            }
+
+            overlay.addEventListener('click', () => {
+                if (toggleButton && sidebar.getAttribute('aria-expanded') === 'true') {
+                    toggleButton.click();
+                }
+            });
+
+            const observer = new MutationObserver(() => {
+                updateOverlay();
+            });
+
+            observer.observe(sidebar, {
+                attributes: true,
+                attributeFilter: ['aria-expanded']
+            });
+
+            updateOverlay();
+        }
+    }
+
+    setupMobileSidebar();
+
+    // If the iframe is ever remounted, swap out the previous mount's resize handler instead of stacking another.
+    if (win.__aipeMobileResize) {
+        win.removeEventListener('resize', win.__aipeMobileResize);
+    }
+    win.__aipeMobileResize = setupMobileSidebar;
+    win.addEventListener('resize', setupMobileSidebar);
+
+    const inputs = doc.querySelectorAll('input[type="text"], input[type="password"], textarea, select');
+    inputs.forEach(input => {
+        if (input.style.fontSize === '' || parseFloat(input.style.fontSize) < 16) {
+            input.style.fontSize = '16px';
+        }
+    });
+})();
@@ -0,0 +1,66 @@
+"""Opt-in on-disk cache for LLM analysis responses keyed by request parameters."""
+
+import orjson
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+
+CACHE_DIR = Path(".data") / "llm_cache"
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+MAX_CACHE_ENTRIES = 256
+MAX_CACHEABLE_TEMPERATURE = 0.3
+# Cached reviews quote user code and are shared by every session on the server, so caching is off unless enabled.
+ENABLE_ENV_VAR = "LLM_RESPONSE_CACHE"
+# Bump when the user message layout changes so older entries stop matching.
+KEY_VERSION = 1
+
+
+def is_enabled() -> bool:
+    return os.getenv(ENABLE_ENV_VAR, "").strip().lower() in ("1", "true", "yes")
+
+
+def is_cacheable(temperature: float) -> bool:
+    return is_enabled() and temperature <= MAX_CACHEABLE_TEMPERATURE
+
+
+def make_key(model: str, mode: str, system_prompt: str, temperature: float, max_tokens: int, language: str, code: str, context: str) -> str:
+    payload = {
+        "version": KEY_VERSION, "model": model, "mode": mode, "system_prompt": system_prompt,
+        "temperature": temperature, "max_tokens": max_tokens, "language": language, "code": code, "context": context,
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def get(key: str) -> Optional[Dict]:
+    path = _entry_path(key)
+    try:
+        entry = orjson.loads(path.read_bytes())
+        if time.time() - entry.get("created_at", 0) > CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        # Touching the file marks it as recently used for LRU eviction.
+        path.touch()
+    except (orjson.JSONDecodeError, IOError):
+        return None
+    return entry
+
+
+def set(key: str, result: str) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _entry_path(key).write_bytes(orjson.dumps({"result": result, "created_at": time.time()}))
+        _evict()
+    except IOError:
+        pass
+
+
+def _evict() -> None:
+    entries = sorted(CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for path in entries[:-MAX_CACHE_ENTRIES]:
+        path.unlink(missing_ok=True)
@@ -1,61 +1,207 @@
-"""Persistent storage for session data using JSON file."""
-
-import json
+"""Persistent storage for session data using gzip-compressed JSON files and a JSON Lines history log."""
+
+import atexit
+import functools
+import gzip
+import itertools
+import os
+import queue
+import threading
+import time
+import orjson
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import hashlib
 
 STORAGE_DIR = Path(".data")
-HISTORY_FILE = STORAGE_DIR / "history.json"
-RESULTS_FILE = STORAGE_DIR / "results.json"
-SETTINGS_FILE = STORAGE_DIR / "settings.json"
+HISTORY_FILE = STORAGE_DIR / "history.jsonl"
+RESULTS_FILE = STORAGE_DIR / "results.json.gz"
+SETTINGS_FILE = STORAGE_DIR / "settings.json.gz"
 MAX_HISTORY_ITEMS = 50
+HISTORY_COMPACT_LINES = MAX_HISTORY_ITEMS * 4
+COMPRESSION_LEVEL = 3
+USAGE_FLUSH_INTERVAL = 5.0
+FLUSH_TIMEOUT = 10.0
+
+# History is an append-only JSON Lines log; the newest entries are mirrored in memory, newest first.
+_history_cache: Optional[Deque[Dict]] = None
+_history_file_lines = 0
+
+# Disk writes run on a background thread. The serialized JSON of documents waiting to be written is
+# kept in _pending_docs so reads issued before the write lands still see the latest data.
+_write_queue: "queue.Queue[Tuple[Path, bytes, bool, Optional[int]]]" = queue.Queue()
+_pending_docs: Dict[Path, Tuple[int, bytes]] = {}
+_write_seq = itertools.count()
+_pending_lock = threading.Lock()
+
+# Token and cost totals are counted in memory and flushed to the settings document periodically.
+_usage: Optional[Dict[str, float]] = None
+_usage_dirty = False
+_usage_flushed_at = 0.0
+_usage_lock = threading.Lock()
 
 
 def _ensure_storage_dir() -> None:
     STORAGE_DIR.mkdir(exist_ok=True)
 
 
+def _compress(payload: bytes) -> bytes:
+    return gzip.compress(payload, compresslevel=COMPRESSION_LEVEL)
+
+
+def _decompress(payload: bytes) -> bytes:
+    return gzip.decompress(payload)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_json_bytes(path_str: str, mtime_ns: int) -> bytes:
+    return _decompress(Path(path_str).read_bytes())
+
+
 def _load_json(filepath: Path) -> Dict:
+    with _pending_lock:
+        pending = _pending_docs.get(filepath)
+    # Decompressed bytes are memoized on (path, mtime), so repeated loads skip disk and gzip until the file changes.
+    # Each call parses its own copy, queued or on disk, so callers may mutate the result freely.
     try:
-        if filepath.exists():
-            with open(filepath, "r") as f:
-                return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        if pending is not None:
+            return orjson.loads(pending[1])
+        return orjson.loads(_read_json_bytes(str(filepath), filepath.stat().st_mtime_ns))
+    except (orjson.JSONDecodeError, EOFError, IOError):
         pass
     return {}
 
 
-def _save_json(filepath: Path, data: Dict) -> None:
-    _ensure_storage_dir()
+def _write_atomic(filepath: Path, payload: bytes) -> None:
+    # Write to a sibling temp file and rename, so a crash never leaves a half-written document.
+    tmp_path = filepath.with_suffix(filepath.suffix + ".tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, filepath)
+    except IOError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _append_bytes(filepath: Path, payload: bytes) -> None:
     try:
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        with filepath.open("ab") as f:
+            f.write(payload)
     except IOError:
         pass
 
 
+def _writer() -> None:
+    while True:
+        try:
+            filepath, payload, append, seq = _write_queue.get(timeout=USAGE_FLUSH_INTERVAL)
+        except queue.Empty:
+            # Idle ticks persist usage counters left dirty since the last add_usage.
+            flush_usage()
+            continue
+        try:
+            _ensure_storage_dir()
+            if append:
+                _append_bytes(filepath, payload)
+            else:
+                _write_atomic(filepath, payload)
+        except OSError:
+            # A failed write is dropped rather than allowed to stop the thread; later writes may still succeed.
+            pass
+        finally:
+            with _pending_lock:
+                # A newer save of the same document may already be queued; leave its entry in place.
+                if seq is not None and _pending_docs.get(filepath, (None,))[0] == seq:
+                    del _pending_docs[filepath]
+                _read_json_bytes.cache_clear()
+            _write_queue.task_done()
+
+
+def _enqueue_write(filepath: Path, payload: bytes, append: bool = False, doc: Optional[bytes] = None) -> None:
+    seq = None
+    if doc is not None:
+        seq = next(_write_seq)
+        with _pending_lock:
+            _pending_docs[filepath] = (seq, doc)
+    _write_queue.put((filepath, payload, append, seq))
+
+
+def flush(timeout: float = FLUSH_TIMEOUT) -> bool:
+    """Persist pending usage counters and wait up to timeout seconds for queued writes to reach disk.
+
+    Returns False if writes were still queued when the wait ended.
+    """
+    flush_usage()
+    deadline = time.monotonic() + timeout
+    with _write_queue.all_tasks_done:
+        while _write_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not _writer_thread.is_alive():
+                return False
+            _write_queue.all_tasks_done.wait(remaining)
+    return True
+
+
+_writer_thread = threading.Thread(target=_writer, name="storage-writer", daemon=True)
+_writer_thread.start()
+atexit.register(flush)
+
+
+def _save_json(filepath: Path, data: Dict, pretty: bool = False) -> None:
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    payload = orjson.dumps(data, default=str, option=option)
+    _enqueue_write(filepath, _compress(payload), doc=payload)
+
+
+def _read_history_file() -> None:
+    global _history_cache, _history_file_lines
+    _history_cache = deque(maxlen=MAX_HISTORY_ITEMS)
+    _history_file_lines = 0
+    try:
+        with HISTORY_FILE.open("rb") as f:
+            # Only the newest lines are kept in memory; older ones are skipped while counting.
+            tail: Deque[bytes] = deque(maxlen=MAX_HISTORY_ITEMS)
+            for line in f:
+                tail.append(line)
+                _history_file_lines += 1
+    except IOError:
+        return
+    for line in tail:
+        try:
+            _history_cache.appendleft(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue
+
+
 def load_history() -> List[Dict]:
-    data = _load_json(HISTORY_FILE)
-    return data.get("history", [])
+    if _history_cache is None:
+        _read_history_file()
+    return list(_history_cache)
 
 
 def save_history(history: List[Dict]) -> None:
+    global _history_cache, _history_file_lines
     history = history[:MAX_HISTORY_ITEMS]
-    _save_json(HISTORY_FILE, {"history": history, "updated_at": datetime.now().isoformat()})
+    payload = b"".join(orjson.dumps(entry, default=str) + b"\n" for entry in reversed(history))
+    _enqueue_write(HISTORY_FILE, payload)
+    _history_cache = deque(history, maxlen=MAX_HISTORY_ITEMS)
+    _history_file_lines = len(history)
 
 
 def add_history_entry(entry: Dict) -> List[Dict]:
-    history = load_history()
-    history.insert(0, entry)
-    history = history[:MAX_HISTORY_ITEMS]
-    save_history(history)
-    return history
+    global _history_file_lines
+    load_history()
+    _enqueue_write(HISTORY_FILE, orjson.dumps(entry, default=str) + b"\n", append=True)
+    _history_cache.appendleft(entry)
+    _history_file_lines += 1
+    if _history_file_lines > HISTORY_COMPACT_LINES:
+        save_history(list(_history_cache))
+    return list(_history_cache)
 
 
 def clear_history() -> None:
-    _save_json(HISTORY_FILE, {"history": [], "updated_at": datetime.now().isoformat()})
+    save_history([])
 
 
 def load_results() -> Dict[str, str]:
@@ -95,26 +241,71 @@ def load_settings() -> Dict:
 
 def save_settings(settings: Dict) -> None:
     settings["updated_at"] = datetime.now().isoformat()
-    _save_json(SETTINGS_FILE, settings)
+    _save_json(SETTINGS_FILE, settings, pretty=True)
 
 
-def get_tokens() -> Dict[str, int]:
+def update_settings(**changes: Any) -> Dict:
     settings = load_settings()
-    return settings.get("tokens", {"input": 0, "output": 0})
+    settings.update(changes)
+    save_settings(settings)
+    return settings
+
+
+def _load_usage() -> Dict[str, float]:
+    global _usage
+    if _usage is None:
+        settings = load_settings()
+        tokens = settings.get("tokens", {"input": 0, "output": 0})
+        _usage = {"input": tokens.get("input", 0), "output": tokens.get("output", 0), "cost": settings.get("total_cost", 0.0)}
+    return _usage
+
+
+def flush_usage() -> None:
+    """Persist the in-memory token and cost counters if they changed since the last flush."""
+    global _usage_dirty, _usage_flushed_at
+    with _usage_lock:
+        if not _usage_dirty:
+            return
+        usage = _load_usage()
+        update_settings(tokens={"input": usage["input"], "output": usage["output"]}, total_cost=usage["cost"])
+        _usage_dirty = False
+        _usage_flushed_at = time.monotonic()
+
+
+def get_tokens() -> Dict[str, int]:
+    usage = _load_usage()
+    return {"input": usage["input"], "output": usage["output"]}
 
 
 def add_tokens(input_tokens: int, output_tokens: int) -> None:
-    settings = load_settings()
-    if "tokens" not in settings:
-        settings["tokens"] = {"input": 0, "output": 0}
-    settings["tokens"]["input"] += input_tokens
-    settings["tokens"]["output"] += output_tokens
-    save_settings(settings)
+    add_usage(input_tokens, output_tokens, 0.0)
 
 
 def get_cost() -> float:
-    settings = load_settings()
-    return settings.get("total_cost", 0.0)
+    return _load_usage()["cost"]
+
+
+def add_cost(cost: float) -> None:
+    add_usage(0, 0, cost)
+
+
+def get_usage() -> Tuple[int, int, float]:
+    """Return (input tokens, output tokens, total cost) from the in-memory counters."""
+    usage = _load_usage()
+    return usage["input"], usage["output"], usage["cost"]
+
+
+def add_usage(input_tokens: int, output_tokens: int, cost: float) -> None:
+    """Record tokens and cost for one analysis; counters are persisted when the writer is idle for USAGE_FLUSH_INTERVAL seconds."""
+    global _usage_dirty
+    with _usage_lock:
+        usage = _load_usage()
+        usage["input"] += input_tokens
+        usage["output"] += output_tokens
+        usage["cost"] += cost
+        _usage_dirty = True
+    if time.monotonic() - _usage_flushed_at >= USAGE_FLUSH_INTERVAL:
+        flush_usage()
 
 
 def get_code_input() -> str:
@@ -123,9 +314,7 @@ def get_code_input() -> str:
 
 
 def save_code_input(code: str) -> None:
-    settings = load_settings()
-    settings["code_input"] = code
-    save_settings(settings)
+    update_settings(code_input=code)
 
 
 def get_review_mode() -> str:
@@ -134,9 +323,7 @@ def get_review_mode() -> str:
 
 
 def save_review_mode(mode: str) -> None:
-    settings = load_settings()
-    settings["review_mode"] = mode
-    save_settings(settings)
+    update_settings(review_mode=mode)
 
 
 def get_analysis_mode() -> str:
@@ -145,19 +332,12 @@ def get_analysis_mode() -> str:
 
 
 def save_analysis_mode(mode: str) -> None:
-    settings = load_settings()
-    settings["analysis_mode"] = mode
-    save_settings(settings)
-
-
-def add_cost(cost: float) -> None:
-    settings = load_settings()
-    settings["total_cost"] = settings.get("total_cost", 0.0) + cost
-    save_settings(settings)
+    update_settings(analysis_mode=mode)
 
 
 def reset_cost_tracker() -> None:
-    settings = load_settings()
-    settings["tokens"] = {"input": 0, "output": 0}
-    settings["total_cost"] = 0.0
-    save_settings(settings)
+    global _usage, _usage_dirty
+    with _usage_lock:
+        _usage = {"input": 0, "output": 0, "cost": 0.0}
+        _usage_dirty = False
+        update_settings(tokens={"input": 0, "output": 0}, total_cost=0.0)
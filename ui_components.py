@@ -1,75 +1,90 @@
 """UI Components and Icon Utilities for AI Pair Engineer."""
 
+import functools
 import streamlit as st
-from typing import Optional
+from typing import Final, Iterable, Optional, Tuple
+
+
+# Static <head> markup for the icon and font stylesheets, built once at import and sent without whitespace.
+_FONT_HEAD_HTML = (
+    '<link rel="dns-prefetch" href="//cdnjs.cloudflare.com">'
+    '<link rel="dns-prefetch" href="//fonts.googleapis.com">'
+    '<link rel="dns-prefetch" href="//fonts.gstatic.com">'
+    '<link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>'
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css"'
+    ' integrity="sha512-DTOQO9RWCH3ppGqcWaEA1BIZOC6xxalwEsw9c2QQeAIftl+Vegovlnee1c9QX4TctnWMn13TZye+giMm8e2LwA=="'
+    ' crossorigin="anonymous" referrerpolicy="no-referrer">'
+    '<link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">'
+)
 
 
 def load_font_awesome() -> None:
     """Load Font Awesome icon library and custom fonts."""
-    st.markdown("""
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css"
-          integrity="sha512-DTOQO9RWCH3ppGqcWaEA1BIZOC6xxalwEsw9c2QQeAIftl+Vegovlnee1c9QX4TctnWMn13TZye+giMm8e2LwA=="
-          crossorigin="anonymous" referrerpolicy="no-referrer" />
-    <link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">
-    """, unsafe_allow_html=True)
+    # Emitted on every rerun: Streamlit removes elements a run does not produce, so a once-per-session guard would drop the links.
+    st.markdown(_FONT_HEAD_HTML, unsafe_allow_html=True)
+
+
+_ICON_PLAIN = '<i class="fas fa-{name} {class_name}" style="font-size: {size};"></i>'
+_ICON_COLORED = '<i class="fas fa-{name} {class_name}" style="font-size: {size}; color: {color};"></i>'
 
 
+@functools.lru_cache(maxsize=512)
 def icon(name: str, size: str = "1em", color: Optional[str] = None, class_name: str = "") -> str:
     """Generate Font Awesome icon HTML."""
-    style = f"font-size: {size};"
-    if color:
-        style += f" color: {color};"
-    return f'<i class="fas fa-{name} {class_name}" style="{style}"></i>'
+    template = _ICON_COLORED if color else _ICON_PLAIN
+    return template.format(name=name, size=size, color=color, class_name=class_name)
 
 
 class Icons:
     """Icon constants using Font Awesome."""
 
-    ROBOT = "robot"
-    CODE = "code"
-    TERMINAL = "terminal"
-    SHIELD = "shield-halved"
-    GEAR = "gear"
-    FILE = "file-code"
-    HISTORY = "clock-rotate-left"
-    DOLLAR = "dollar-sign"
-    REFRESH = "arrows-rotate"
-    TRASH = "trash"
-    COPY = "copy"
-    CHECK = "check-circle"
-    EXCLAMATION = "exclamation-triangle"
-    INFO = "circle-info"
-    XMARK = "xmark-circle"
-    SEARCH = "magnifying-glass"
-    FLASK = "flask"
-    REFACTOR = "code-branch"
-    SECURITY = "shield-halved"
-    REVIEW = "clipboard-check"
-    UPLOAD = "upload"
-    DOWNLOAD = "download"
-    CLEAR = "eraser"
-    ANALYZE = "play"
-    SETTINGS = "sliders"
-    MOON = "moon"
-    SUN = "sun"
-    SUCCESS = "check-circle"
-    ERROR = "circle-xmark"
-    WARNING = "triangle-exclamation"
-    LOADING = "spinner"
-    BOLT = "bolt"
-    CHART = "chart-line"
-    BUG = "bug"
-    LOCK = "lock"
-    KEY = "key"
-    SERVER = "server"
-    DATABASE = "database"
-    CLOUD = "cloud"
-    ROCKET = "rocket"
-    FIRE = "fire"
-    STAR = "star"
-    BRAIN = "brain"
-    FOLDER = "folder-open"
-    PROJECT = "folder-tree"
+    ROBOT: Final = "robot"
+    CODE: Final = "code"
+    TERMINAL: Final = "terminal"
+    SHIELD: Final = "shield-halved"
+    GEAR: Final = "gear"
+    FILE: Final = "file-code"
+    HISTORY: Final = "clock-rotate-left"
+    DOLLAR: Final = "dollar-sign"
+    REFRESH: Final = "arrows-rotate"
+    TRASH: Final = "trash"
+    COPY: Final = "copy"
+    CHECK: Final = "check-circle"
+    EXCLAMATION: Final = "exclamation-triangle"
+    INFO: Final = "circle-info"
+    XMARK: Final = "xmark-circle"
+    SEARCH: Final = "magnifying-glass"
+    FLASK: Final = "flask"
+    REFACTOR: Final = "code-branch"
+    SECURITY: Final = "shield-halved"
+    REVIEW: Final = "clipboard-check"
+    UPLOAD: Final = "upload"
+    DOWNLOAD: Final = "download"
+    CLEAR: Final = "eraser"
+    ANALYZE: Final = "play"
+    SETTINGS: Final = "sliders"
+    MOON: Final = "moon"
+    SUN: Final = "sun"
+    SUCCESS: Final = "check-circle"
+    ERROR: Final = "circle-xmark"
+    WARNING: Final = "triangle-exclamation"
+    LOADING: Final = "spinner"
+    BOLT: Final = "bolt"
+    CHART: Final = "chart-line"
+    BUG: Final = "bug"
+    LOCK: Final = "lock"
+    KEY: Final = "key"
+    SERVER: Final = "server"
+    DATABASE: Final = "database"
+    CLOUD: Final = "cloud"
+    ROCKET: Final = "rocket"
+    FIRE: Final = "fire"
+    STAR: Final = "star"
+    BRAIN: Final = "brain"
+    FOLDER: Final = "folder-open"
+    PROJECT: Final = "folder-tree"
 
 
 def render_icon_text(icon_name: str, text: str, size: str = "1em") -> str:
@@ -77,75 +92,64 @@ def render_icon_text(icon_name: str, text: str, size: str = "1em") -> str:
     return f'{icon(icon_name, size)} {text}'
 
 
+_STATUS_ICONS = {
+    "success": Icons.SUCCESS,
+    "error": Icons.ERROR,
+    "warning": Icons.WARNING,
+    "info": Icons.INFO,
+}
+
+# Badge, card and stats markup only varies in a few fields, so the templates and fixed icons are built at import.
+# Their styling lives in assets/styles.css; badge and card icons inherit the element color.
+_STATUS_BADGE_TEMPLATE = '<span class="status-badge status-badge-{status}">{icon}{text}</span>'
+
+# Each known status gets its badge with class and icon already filled in, leaving only the text to format.
+_STATUS_BADGE_PREBUILT = {
+    status: _STATUS_BADGE_TEMPLATE.format(status=status, icon=icon(icon_name, "0.9em"), text="{text}")
+    for status, icon_name in _STATUS_ICONS.items()
+}
+
+_METRIC_CARD_TEMPLATE = (
+    '<div class="metric-card" style="--c:{color}">'
+    '<div class="metric-card-icon">{icon}</div>'
+    '<div class="metric-card-value">{value}</div>'
+    '<div class="metric-card-label">{label}</div>'
+    '</div>'
+)
+
+_CODE_STATS_TEMPLATE = (
+    '<div class="code-stats">'
+    '<span>' + icon("align-left", "0.9em", "#58a6ff") + ' <strong>{lines}</strong> lines</span>'
+    '<span>' + icon("text-width", "0.9em", "#a371f7") + ' <strong>{chars}</strong> chars</span>'
+    '</div>'
+)
+
+
 def render_status_badge(status: str, text: str) -> str:
     """Render a status badge with icon."""
-    status_config = {
-        "success": (Icons.SUCCESS, "#7ee787"),
-        "error": (Icons.ERROR, "#f85149"),
-        "warning": (Icons.WARNING, "#d29922"),
-        "info": (Icons.INFO, "#58a6ff"),
-    }
-    icon_name, color = status_config.get(status, (Icons.INFO, "#58a6ff"))
-    return f'''
-    <span style="
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        padding: 4px 10px;
-        border-radius: 6px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        background: {color}15;
-        color: {color};
-        border: 1px solid {color}30;
-    ">
-        {icon(icon_name, "0.9em", color)}
-        {text}
-    </span>
-    '''
+    return _STATUS_BADGE_PREBUILT.get(status, _STATUS_BADGE_PREBUILT["info"]).format(text=text)
+
+
+def render_status_badges(items: Iterable[Tuple[str, str]]) -> str:
+    """Render several (status, text) badges as one HTML string for a single st.markdown call."""
+    return "".join([render_status_badge(status, text) for status, text in items])
 
 
 def render_metric_card(label: str, value: str, icon_name: str, color: str = "#58a6ff") -> str:
     """Render a custom metric card."""
-    return f'''
-    <div style="
-        background: linear-gradient(135deg, {color}10 0%, {color}05 100%);
-        border: 1px solid {color}30;
-        border-radius: 12px;
-        padding: 1rem;
-        text-align: center;
-    ">
-        <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">
-            {icon(icon_name, "1.5rem", color)}
-        </div>
-        <div style="
-            font-family: 'JetBrains Mono', monospace;
-            font-size: 1.5rem;
-            font-weight: 700;
-            color: {color};
-        ">{value}</div>
-        <div style="
-            font-size: 0.75rem;
-            color: #8b949e;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            margin-top: 0.25rem;
-        ">{label}</div>
-    </div>
-    '''
+    return _METRIC_CARD_TEMPLATE.format(color=color, icon=icon(icon_name, "1.5rem"), value=value, label=label)
+
+
+def render_metric_cards(items: Iterable[Tuple[str, ...]]) -> str:
+    """Render several (label, value, icon_name[, color]) cards as one HTML string for a single st.markdown call."""
+    return "".join([render_metric_card(*item) for item in items])
+
+
+@functools.lru_cache(maxsize=1024)
+def _grouped(n: int) -> str:
+    return format(n, ",")
 
 
 def render_code_stats(lines: int, chars: int) -> str:
     """Render code statistics."""
-    return f'''
-    <div style="
-        display: flex;
-        gap: 1rem;
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.85rem;
-        color: #8b949e;
-    ">
-        <span>{icon("align-left", "0.9em", "#58a6ff")} <strong style="color: #e6edf3;">{lines:,}</strong> lines</span>
-        <span>{icon("text-width", "0.9em", "#a371f7")} <strong style="color: #e6edf3;">{chars:,}</strong> chars</span>
-    </div>
-    '''
+    return _CODE_STATS_TEMPLATE.format(lines=_grouped(lines), chars=_grouped(chars))